@@ -12,100 +12,252 @@ Repo expectation (recommended):
 - ./臺北市準公共化托嬰中心.csv   (base center list, has 序號/機構名稱/地址/電話... and maybe 評鑑結果 like 111-乙)
 - ./XY Data.csv                  (geocoded points, has id/Response_Address/lat/lng)
 - ./data.json                    (output)
+- ./data.taipei.cache.json       (last API response + ETag/Last-Modified, for conditional GET)
 
 Scheduling:
 - Designed to be run daily by GitHub Actions; it will only update once every 10 days
   unless FORCE_UPDATE=1 is set.
+- OUTPUT_GZIP=1 also writes ./data.json.gz next to data.json.
+- MERGE_WORKERS=N merges centers in N processes (only worth it for large lists).
 """
 from __future__ import annotations
 
 import csv
-import json
+import gzip
+import hashlib
+import math
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-import requests
+import httpx
+import ijson
+import orjson
 
 
 API_BASE = "https://data.taipei/api/v1/dataset/43c0bdc5-ddb0-40bf-accd-a096d8c5ac23?scope=resourceAquire"
 OUTPUT_JSON = "data.json"
+API_CACHE_JSON = "data.taipei.cache.json"  # last API pages + ETag/Last-Modified
 CENTERS_CSV = "臺北市準公共化托嬰中心.csv"
 XY_CSV = "XY Data.csv"
 
+# Base-list columns read from CENTERS_CSV, in the order build_center() unpacks them
+CENTER_COLUMNS = ("序號", "機構名稱", "行政區", "地址", "電話", "核定收托人數", "實際收托人數", "評鑑結果")
+
 UPDATE_INTERVAL_DAYS = 10
+# GitHub runner is UTC. Use fixed offset +08:00 for Taipei.
+TAIPEI_TZ = timezone(timedelta(hours=8))
 DEFAULT_LIMIT = 1000  # dataset count is small (~hundreds)
+FETCH_WORKERS = 4     # concurrent page requests after the first page
 
+# Run bookkeeping in meta (timestamps, fetch validators, input digests); excluded from
+# content_hash so data.json is only rewritten when the merged result changes
+VOLATILE_META_KEYS = (
+    "fetched_at",
+    "last_successful_update",
+    "content_hash",
+    "api_etag",
+    "api_last_modified",
+    "api_payload_sha256",
+    "local_inputs_sha256",
+    "inputs_fingerprint",
+)
 
-YEAR_COL_RE = re.compile(r"^(?P<yr>\d{3})年$")          # e.g. "114年"
-LEGACY_EVAL_RE = re.compile(r"^(?P<yr>\d{3})\s*[-－]\s*(?P<grade>.+?)\s*$")  # e.g. "111-乙"
 
+# Used with fullmatch(), so no anchors needed
+YEAR_COL_RE = re.compile(r"(?P<yr>\d{3})年")          # e.g. "114年"
+LEGACY_EVAL_RE = re.compile(r"(?P<yr>\d{3})\s*[-－]\s*(?P<grade>.+?)\s*")  # e.g. "111-乙"
 
-def now_taipei_iso() -> str:
-    # GitHub runner is UTC. Use fixed offset +08:00 for Taipei.
-    tz = timezone(timedelta(hours=8))
-    return datetime.now(tz=tz).replace(microsecond=0).isoformat()
+# API column name -> Minguo year (or None); records share the same keys
+_year_key_cache: Dict[str, Optional[str]] = {}
 
+# Lookup tables for build_center(), installed by init_merge()
+_merge_existing: Dict[int, Dict[str, str]] = {}
+_merge_xy: Dict[int, Dict[str, Any]] = {}
+_merge_api_by_no: Dict[int, Dict[str, Any]] = {}
+_merge_api_by_name: Dict[str, Dict[str, Any]] = {}
 
-def safe_int(x: Any) -> Optional[int]:
-    try:
-        return int(str(x).strip())
-    except Exception:
-        return None
 
+def now_taipei_iso() -> str:
+    return datetime.now(tz=TAIPEI_TZ).replace(microsecond=0).isoformat()
 
-def load_csv(path: str) -> List[Dict[str, str]]:
-    with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        return [dict(r) for r in reader]
 
+def safe_int(x: Any) -> Optional[int]:
+    s = str(x).strip()
+    digits = s[1:] if s[:1] in ("-", "+") else s
+    # isdecimal() accepts the plain digit strings int() parses ('_' separators are rejected),
+    # so no try/except needed
+    return int(s) if digits.isdecimal() else None
 
-def fetch_all_records() -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
-    """Fetch all records using limit/offset paging."""
-    out: List[Dict[str, Any]] = []
-    offset = 0
-    meta: Dict[str, Any] = {}
-    session = requests.Session()
-    session.headers.update({"User-Agent": "taipei-daycare-map/1.0 (+github-actions)"})
 
-    while True:
-        url = f"{API_BASE}&limit={DEFAULT_LIMIT}&offset={offset}"
-        resp = session.get(url, timeout=60)
-        resp.raise_for_status()
-        payload = resp.json()
-        result = payload.get("result", {})
-        if not meta:
-            meta = {
-                "api_url": API_BASE,
-                "reported_count": result.get("count"),
-                "reported_limit": result.get("limit"),
-                "reported_offset": result.get("offset"),
-            }
+def _s(d: Dict[str, Any], k: str) -> str:
+    """d[k] as a stripped str ("" if missing/None); API values are usually str already."""
+    v = d.get(k)
+    if isinstance(v, str):
+        return v.strip()
+    return "" if v is None else str(v).strip()
 
-        records = result.get("results", []) or []
-        out.extend(records)
 
-        count = result.get("count", len(out))
-        if len(out) >= int(count):
-            break
-        offset += DEFAULT_LIMIT
+def iter_csv_columns(path: str, columns: Sequence[str]) -> Iterator[Tuple[str, ...]]:
+    """Yield only the given columns, as tuples in that order (missing -> "")."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        pos = {name: i for i, name in enumerate(header)}
+        idx = [pos.get(name) for name in columns]
+        for row in reader:
+            n = len(row)
+            yield tuple(row[i] if i is not None and i < n else "" for i in idx)
 
-    return out, meta
+
+def load_api_cache(path: str) -> Dict[str, Dict[str, Any]]:
+    """Previous API pages keyed by page URL (validators + parsed result)."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "rb") as f:
+            cache = orjson.loads(f.read())
+    except Exception:
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _api_client() -> httpx.Client:
+    return httpx.Client(
+        http2=True,
+        headers={"User-Agent": "taipei-daycare-map/1.0 (+github-actions)"},
+        timeout=60,
+    )
+
+
+class _HashingReader:
+    """Minimal file-like object over a byte-chunk iterator, hashing what it hands out."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._buf = bytearray()
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson's C backend expects at most `size` bytes back, so buffer the remainder
+        while size < 0 or len(self._buf) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self.sha256.update(chunk)
+            self._buf += chunk
+        n = len(self._buf) if size < 0 else size
+        data = bytes(self._buf[:n])
+        del self._buf[:n]
+        return data
+
+
+def parse_api_result(f: Any) -> Dict[str, Any]:
+    """Stream-parse an API body into its "result" object (scalar fields + results list)."""
+    result: Dict[str, Any] = {}
+
+    def tap_scalars(events: Iterator[Tuple[str, str, Any]]) -> Iterator[Tuple[str, str, Any]]:
+        for prefix, event, value in events:
+            # e.g. ("result.count", "number", 292)
+            if prefix.count(".") == 1 and prefix.startswith("result.") and event in ("number", "string", "boolean", "null"):
+                result[prefix[len("result."):]] = value
+            yield prefix, event, value
+
+    events = tap_scalars(ijson.parse(f, use_float=True))
+    result["results"] = list(ijson.items(events, "result.results.item"))
+    return result
+
+
+def _fetch_page(
+    client: httpx.Client, offset: int, cache: Dict[str, Dict[str, Any]]
+) -> Tuple[str, Dict[str, Any], bool]:
+    """Conditional GET of one page; returns (url, cache entry, served_from_cache)."""
+    url = f"{API_BASE}&limit={DEFAULT_LIMIT}&offset={offset}"
+    cached = cache.get(url)
+    headers: Dict[str, str] = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    with client.stream("GET", url, headers=headers) as resp:
+        if resp.status_code == 304 and cached:
+            return url, cached, True
+        resp.raise_for_status()
+        # Parse while downloading, so the whole body is never held next to the parsed records
+        body = _HashingReader(resp.iter_bytes())
+        entry = {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "result": parse_api_result(body),
+            "payload_sha256": body.sha256.hexdigest(),
+        }
+    return url, entry, False
+
+
+def fetch_all_records() -> Tuple[Iterator[Dict[str, Any]], Dict[str, Any]]:
+    """Fetch all records using limit/offset paging.
+
+    The first page doubles as a probe for the total count; remaining pages
+    (if any) are fetched concurrently. Pages are requested conditionally
+    against API_CACHE_JSON, and a 304 reuses the cached result, so an
+    unchanged (single-page) dataset costs one bodiless round-trip. Records
+    are returned as an iterator over the pages, not copied into one list.
+    """
+    cache = load_api_cache(API_CACHE_JSON)
+
+    # One HTTP/2 connection; concurrent page requests are multiplexed over it
+    with _api_client() as client:
+        pages = [_fetch_page(client, 0, cache)]
+        result = pages[0][1]["result"]
+        count = int(result.get("count", len(result.get("results", []) or [])) or 0)
+        offsets = range(DEFAULT_LIMIT, count, DEFAULT_LIMIT)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+                # map() keeps page order, so records stay in offset order
+                pages.extend(pool.map(lambda o: _fetch_page(client, o, cache), offsets))
+
+    # Only keep pages that still exist, so the cache doesn't grow stale entries
+    new_cache = {url: entry for url, entry, _ in pages}
+    if new_cache != cache:
+        write_atomic(API_CACHE_JSON, orjson.dumps(new_cache) + b"\n")
+
+    first = pages[0][1]
+    meta: Dict[str, Any] = {
+        "api_url": API_BASE,
+        "reported_count": result.get("count"),
+        "reported_limit": result.get("limit"),
+        "reported_offset": result.get("offset"),
+        "etag": first.get("etag"),
+        "last_modified": first.get("last_modified"),
+        # one digest over all pages, in offset order
+        "payload_sha256": hashlib.sha256("".join(e["payload_sha256"] for _, e, _ in pages).encode()).hexdigest(),
+        "not_modified": all(hit for _, _, hit in pages),
+    }
+    records = chain.from_iterable(entry["result"].get("results", []) or [] for _, entry, _ in pages)
+    return records, meta
 
 
 def parse_eval_years(rec: Dict[str, Any]) -> Dict[str, str]:
     """Extract year->grade from keys like '110年'.."""
     years: Dict[str, str] = {}
     for k, v in rec.items():
-        m = YEAR_COL_RE.match(str(k).strip())
-        if not m:
+        if k in _year_key_cache:
+            yr = _year_key_cache[k]
+        else:
+            m = YEAR_COL_RE.fullmatch(str(k).strip())
+            yr = _year_key_cache[k] = m.group("yr") if m else None
+        if yr is None:
             continue
-        yr = m.group("yr")
-        grade = "" if v is None else str(v).strip()
-        years[yr] = grade
+        # v is already in hand, so strip it directly rather than via _s(rec, k)
+        grade = v.strip() if isinstance(v, str) else ("" if v is None else str(v).strip())
+        years[yr] = sys.intern(grade)  # a handful of grades (優/甲/乙/...) repeat everywhere
     return years
 
 
@@ -113,23 +265,102 @@ def normalize_lat_lng(lat: Optional[float], lng: Optional[float]) -> Tuple[Optio
     """Fix common swap: if lat looks like 121.x and lng looks like 25.x, swap."""
     if lat is None or lng is None:
         return lat, lng
-    try:
-        if abs(lat) > 90 and abs(lng) <= 90:
-            return lng, lat
-    except Exception:
-        pass
+    if abs(lat) > 90 and abs(lng) <= 90:
+        return lng, lat
     return lat, lng
 
 
+def load_xy_map(path: str) -> Dict[int, Dict[str, Any]]:
+    """Geocodes by id from XY Data.csv (id/Response_Address/lat/lng)."""
+    xy_map: Dict[int, Dict[str, Any]] = {}
+    for raw_id, resp_addr, raw_lat, raw_lng in iter_csv_columns(path, ("id", "Response_Address", "lat", "lng")):
+        cid = safe_int(raw_id)
+        if not cid:
+            continue
+        try:
+            lat: Optional[float] = float(raw_lat or "nan")
+            lng: Optional[float] = float(raw_lng or "nan")
+        except ValueError:
+            lat, lng = None, None
+        if lat is not None and math.isnan(lat):
+            lat = None
+        if lng is not None and math.isnan(lng):
+            lng = None
+        lat, lng = normalize_lat_lng(lat, lng)
+        xy_map[cid] = {
+            "response_address": resp_addr.strip(),
+            "lat": lat,
+            "lng": lng,
+        }
+    return xy_map
+
+
+def write_atomic(path: str, payload: bytes) -> None:
+    """Write payload to path via a temp file + rename, so readers never see a partial file."""
+    tmp = path + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:  # os.write may write less than asked
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
+def write_output(out: Dict[str, Any]) -> None:
+    """Write data.json (and data.json.gz when OUTPUT_GZIP=1)."""
+    # orjson emits UTF-8 bytes directly (non-ASCII kept as-is, like ensure_ascii=False)
+    payload = orjson.dumps(out, option=orjson.OPT_INDENT_2) + b"\n"
+    write_atomic(OUTPUT_JSON, payload)
+    if os.getenv("OUTPUT_GZIP", "").strip() == "1":
+        # mtime=0 keeps the .gz byte-identical for identical content
+        write_atomic(OUTPUT_JSON + ".gz", gzip.compress(payload, compresslevel=6, mtime=0))
+
+
+def refresh_existing_meta(existing: Dict[str, Any], updates: Dict[str, Any]) -> None:
+    """Rewrite the previous data.json with only run bookkeeping in meta updated."""
+    existing.setdefault("meta", {}).update(updates)
+    write_output(existing)
+
+
 def load_existing_json(path: str) -> Optional[Dict[str, Any]]:
     if not os.path.exists(path):
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def content_hash(out: Dict[str, Any]) -> str:
+    """SHA-256 of the output, ignoring per-run timestamps (and the hash itself)."""
+    meta = {k: v for k, v in out.get("meta", {}).items() if k not in VOLATILE_META_KEYS}
+    payload = orjson.dumps({"meta": meta, "centers": out.get("centers", [])})
+    return hashlib.sha256(payload).hexdigest()
+
+
+def local_inputs_digest() -> str:
+    """Digest of the repo-side merge inputs: base CSVs and this script."""
+    h = hashlib.sha256()
+    for path in (CENTERS_CSV, XY_CSV, __file__):
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                h.update(hashlib.sha256(f.read()).digest())
+        else:
+            h.update(b"-")
+    return h.hexdigest()
+
+
+def inputs_fingerprint(api_meta: Dict[str, Any], local_digest: str) -> str:
+    """Digest of everything the merge depends on: API payload plus local inputs."""
+    return hashlib.sha256(f"{api_meta.get('payload_sha256')}:{local_digest}".encode("utf-8")).hexdigest()
+
+
+def force_update_requested() -> bool:
+    return os.getenv("FORCE_UPDATE", "").strip() == "1"
 
 
 def should_run_update(existing: Optional[Dict[str, Any]]) -> bool:
-    if os.getenv("FORCE_UPDATE", "").strip() == "1":
+    if force_update_requested():
         return True
     if not existing:
         return True
@@ -144,15 +375,98 @@ def should_run_update(existing: Optional[Dict[str, Any]]) -> bool:
         return True
 
     # Compare in Taipei time (fixed +08:00)
-    tz = timezone(timedelta(hours=8))
-    now_dt = datetime.now(tz=tz)
+    now_dt = datetime.now(tz=TAIPEI_TZ)
     if last_dt.tzinfo is None:
-        last_dt = last_dt.replace(tzinfo=tz)
+        last_dt = last_dt.replace(tzinfo=TAIPEI_TZ)
 
     return (now_dt - last_dt) >= timedelta(days=UPDATE_INTERVAL_DAYS)
 
 
+@dataclass(slots=True)
+class CenterOut:
+    """One entry of data.json "centers"; orjson serializes fields in this order."""
+    id: int
+    name: str
+    district: str
+    address: str
+    phone: str
+    capacity_approved: str
+    capacity_current: str
+    response_address: Optional[str]
+    lat: Optional[float]
+    lng: Optional[float]
+    evaluation_by_year: Dict[str, str]
+    source_importdate: Optional[str]
+
+
+def init_merge(
+    existing_by_id: Dict[int, Dict[str, str]],
+    xy_map: Dict[int, Dict[str, Any]],
+    api_by_no: Dict[int, Dict[str, Any]],
+    api_by_name: Dict[str, Dict[str, Any]],
+) -> None:
+    """Install the lookup tables used by build_center() (also a pool initializer)."""
+    global _merge_existing, _merge_xy, _merge_api_by_no, _merge_api_by_name
+    _merge_existing = existing_by_id
+    _merge_xy = xy_map
+    _merge_api_by_no = api_by_no
+    _merge_api_by_name = api_by_name
+
+
+def build_center(row: Tuple[str, ...]) -> Optional[Tuple[CenterOut, bool]]:
+    """Merge one base-list row (CENTER_COLUMNS order) with previous/legacy/API evaluations and geocodes.
+
+    Returns (center, matched_in_api), or None if the row has no usable 序號.
+    """
+    raw_id, name, district, address, phone, cap, actual, legacy = (v.strip() for v in row)
+    cid = safe_int(raw_id)
+    if cid is None:
+        return None
+    # ~12 districts repeated across hundreds of rows; share one str each
+    district = sys.intern(district)
+
+    # Legacy single field like "111-乙" from your CSV if present
+    m = LEGACY_EVAL_RE.fullmatch(legacy)
+    legacy_eval = {sys.intern(m.group("yr")): sys.intern(m.group("grade").strip())} if m else {}
+
+    # Yearly fields from API dataset
+    rec = _merge_api_by_no.get(cid) or _merge_api_by_name.get(name)
+    api_eval = parse_eval_years(rec) if rec else {}
+
+    # One merge, later wins: existing data.json < legacy CSV field < API
+    eval_by_year = {**_merge_existing.get(cid, {}), **legacy_eval, **api_eval}
+
+    source_importdate = None
+    if rec:
+        imp = rec.get("_importdate", {})
+        # sample: {"date":"2025-12-15 10:17:58.487468","timezone":"Asia/Taipei",...}
+        if isinstance(imp, dict) and imp.get("date"):
+            source_importdate = str(imp.get("date"))
+
+    # Attach geocodes (if any)
+    geo = _merge_xy.get(cid, {})
+    lat = geo.get("lat")
+    lng = geo.get("lng")
+
+    center = CenterOut(
+        id=cid,
+        name=name,
+        district=district,
+        address=address,
+        phone=phone,
+        capacity_approved=cap,
+        capacity_current=actual,
+        response_address=geo.get("response_address"),
+        lat=lat,
+        lng=lng,
+        evaluation_by_year={yr: eval_by_year[yr] for yr in sorted(eval_by_year)},
+        source_importdate=source_importdate,
+    )
+    return center, rec is not None
+
+
 def main() -> int:
+    now_iso = now_taipei_iso()  # one timestamp for every meta field written by this run
     existing = load_existing_json(OUTPUT_JSON)
     if not should_run_update(existing):
         print(f"Skip: last update < {UPDATE_INTERVAL_DAYS} days. (Set FORCE_UPDATE=1 to bypass)")
@@ -162,112 +476,98 @@ def main() -> int:
     if not os.path.exists(CENTERS_CSV):
         print(f"ERROR: missing {CENTERS_CSV} in repo root.")
         return 2
-    centers = load_csv(CENTERS_CSV)
 
-    xy_map: Dict[int, Dict[str, Any]] = {}
-    if os.path.exists(XY_CSV):
-        for r in load_csv(XY_CSV):
-            cid = safe_int(r.get("id"))
-            if not cid:
-                continue
-            try:
-                lat = float(r.get("lat", "") or "nan")
-                lng = float(r.get("lng", "") or "nan")
-            except Exception:
-                lat, lng = None, None
-            if lat is not None and (str(lat) == "nan"):
-                lat = None
-            if lng is not None and (str(lng) == "nan"):
-                lng = None
-            lat, lng = normalize_lat_lng(lat, lng)
-            xy_map[cid] = {
-                "response_address": (r.get("Response_Address") or "").strip(),
-                "lat": lat,
-                "lng": lng,
-            }
+    local_digest = local_inputs_digest()
+    old_meta = existing.get("meta", {}) if existing else {}
 
     # Fetch evaluations from API
     records, api_meta = fetch_all_records()
+    if api_meta.get("not_modified"):
+        print("API not modified since last fetch; using cached records")
+
+    # Same API payload (e.g. every page answered 304), CSVs and script as last time
+    # -> the merge would reproduce data.json
+    fingerprint = inputs_fingerprint(api_meta, local_digest)
+    # Run bookkeeping after a fetch (VOLATILE_META_KEYS minus content_hash); both
+    # no-change exits below refresh exactly these fields in the previous data.json
+    run_meta: Dict[str, Any] = {
+        "fetched_at": now_iso,
+        "last_successful_update": now_iso,
+        "api_etag": api_meta.get("etag"),
+        "api_last_modified": api_meta.get("last_modified"),
+        "api_payload_sha256": api_meta.get("payload_sha256"),
+        "local_inputs_sha256": local_digest,
+        "inputs_fingerprint": fingerprint,
+    }
+    if not force_update_requested() and existing and existing.get("centers") \
+            and old_meta.get("inputs_fingerprint") == fingerprint:
+        refresh_existing_meta(existing, run_meta)
+        print("No change in inputs; bumped run metadata only")
+        return 0
+
+    # Rows are streamed straight into build_center(), never held as a list
+    centers = iter_csv_columns(CENTERS_CSV, CENTER_COLUMNS)
+    xy_map = load_xy_map(XY_CSV) if os.path.exists(XY_CSV) else {}
 
     # Index API by 編號 (string)
     api_by_no: Dict[int, Dict[str, Any]] = {}
     api_by_name: Dict[str, Dict[str, Any]] = {}
+    n_records = 0
     for rec in records:
+        n_records += 1
         no = safe_int(rec.get("編號"))
         if no is not None:
             api_by_no[no] = rec
-        name = str(rec.get("機構名稱") or "").strip()
+        name = _s(rec, "機構名稱")
         if name:
             api_by_name[name] = rec
 
-    out_centers: List[Dict[str, Any]] = []
+    out_centers: List[CenterOut] = []
     unmatched: List[int] = []
 
-    for c in centers:
-        cid = safe_int(c.get("序號"))
-        if cid is None:
-            continue
+    # Index previous evaluation_by_year by id once, instead of scanning per center
+    existing_by_id: Dict[int, Dict[str, str]] = {}
+    if existing:
+        for old in existing.get("centers", []):
+            old_id = safe_int(old.get("id"))
+            if old_id is not None and old_id not in existing_by_id:
+                existing_by_id[old_id] = old.get("evaluation_by_year", {}) or {}
+
+    merge_tables = (existing_by_id, xy_map, api_by_no, api_by_name)
+    workers = safe_int(os.getenv("MERGE_WORKERS", "")) or 1
+    pool: Optional[ProcessPoolExecutor] = None
+    if workers > 1:
+        # Tables are shipped once per worker via the initializer, not per task
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=init_merge, initargs=merge_tables)
+        built = pool.map(build_center, centers, chunksize=64)
+    else:
+        init_merge(*merge_tables)
+        built = map(build_center, centers)
 
-        name = (c.get("機構名稱") or "").strip()
-        district = (c.get("行政區") or "").strip()
-        address = (c.get("地址") or "").strip()
-        phone = (c.get("電話") or "").strip()
-        cap = (c.get("核定收托人數") or "").strip()
-        actual = (c.get("實際收托人數") or "").strip()
-
-        # Start evaluation_by_year with anything we already have from existing data.json
-        eval_by_year: Dict[str, str] = {}
-        if existing:
-            for old in existing.get("centers", []):
-                if safe_int(old.get("id")) == cid:
-                    eval_by_year.update(old.get("evaluation_by_year", {}) or {})
-                    break
-
-        # Merge legacy single field like "111-乙" from your CSV if present
-        legacy = (c.get("評鑑結果") or "").strip()
-        m = LEGACY_EVAL_RE.match(legacy)
-        if m:
-            eval_by_year[m.group("yr")] = m.group("grade").strip()
-
-        # Merge yearly fields from API dataset
-        rec = api_by_no.get(cid) or api_by_name.get(name)
-        source_importdate = None
-        if rec:
-            eval_by_year.update(parse_eval_years(rec))
-            imp = rec.get("_importdate", {})
-            # sample: {"date":"2025-12-15 10:17:58.487468","timezone":"Asia/Taipei",...}
-            if isinstance(imp, dict) and imp.get("date"):
-                source_importdate = str(imp.get("date"))
-        else:
-            unmatched.append(cid)
-
-        # Attach geocodes (if any)
-        geo = xy_map.get(cid, {})
-        lat = geo.get("lat")
-        lng = geo.get("lng")
-
-        out_centers.append({
-            "id": cid,
-            "name": name,
-            "district": district,
-            "address": address,
-            "phone": phone,
-            "capacity_approved": cap,
-            "capacity_current": actual,
-            "response_address": geo.get("response_address"),
-            "lat": lat,
-            "lng": lng,
-            "evaluation_by_year": dict(sorted(eval_by_year.items(), key=lambda kv: kv[0])),
-            "source_importdate": source_importdate,
-        })
+    try:
+        for item in built:
+            if item is None:
+                continue
+            center, matched = item
+            out_centers.append(center)
+            if not matched:
+                unmatched.append(center.id)
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
     out = {
         "meta": {
             "source": API_BASE,
-            "fetched_at": now_taipei_iso(),
-            "last_successful_update": now_taipei_iso(),
+            "fetched_at": run_meta["fetched_at"],
+            "last_successful_update": run_meta["last_successful_update"],
             "update_interval_days": UPDATE_INTERVAL_DAYS,
             "api_reported_count": api_meta.get("reported_count"),
+            "api_etag": run_meta["api_etag"],
+            "api_last_modified": run_meta["api_last_modified"],
+            "api_payload_sha256": run_meta["api_payload_sha256"],
+            "local_inputs_sha256": run_meta["local_inputs_sha256"],
+            "inputs_fingerprint": run_meta["inputs_fingerprint"],
             "notes": "evaluation_by_year uses Minguo year as string keys, e.g. '114'. Values like '優/甲/乙/丙/已歇業/...' are kept as-is.",
             "unmatched_center_ids_in_base_list": unmatched[:50],  # avoid huge meta; see logs for full
             "unmatched_count": len(unmatched),
@@ -275,20 +575,18 @@ def main() -> int:
         "centers": out_centers,
     }
 
-    # Write only if changed to reduce noise
-    new_json = json.dumps(out, ensure_ascii=False, indent=2, sort_keys=False)
-    old_json = None
-    if os.path.exists(OUTPUT_JSON):
-        old_json = open(OUTPUT_JSON, "r", encoding="utf-8").read()
-
-    if old_json == new_json:
-        print("No change in data.json")
+    # The hash (run bookkeeping excluded) decides whether centers/meta are rewritten
+    # or only the run bookkeeping of the previous data.json is refreshed
+    digest = content_hash(out)
+    if existing and old_meta.get("content_hash") == digest:
+        # Still record the run (and current validators/digests) so the 10-day gate holds
+        refresh_existing_meta(existing, run_meta)
+        print("No change in centers; bumped run metadata only")
         return 0
 
-    with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-        f.write(new_json)
-        f.write("\n")
-    print(f"Updated {OUTPUT_JSON}: centers={len(out_centers)}, api_records={len(records)}, unmatched={len(unmatched)}")
+    out["meta"]["content_hash"] = digest
+    write_output(out)
+    print(f"Updated {OUTPUT_JSON}: centers={len(out_centers)}, api_records={n_records}, unmatched={len(unmatched)}")
     return 0
 
 